@@ -7,8 +7,9 @@ for authentication. It handles automatic detection of the latest suitable ODBC d
 and integrates with Fabric's `notebookutils.credentials` (or mock credentials for local testing).
 
 Functions:
-    - get_fabric_warehouse_engine: Create a SQLAlchemy engine for a given Fabric SQL endpoint.
+    - get_fabric_warehouse_engine: Create (or reuse) a SQLAlchemy engine for a Fabric SQL endpoint.
     - validate_fabric_warehouse_engine: Run a test query to verify the engine connection.
+    - dispose_fabric_engines: Dispose of all cached engines and clear the engine cache.
 
 Dependencies:
     - pyodbc
@@ -16,44 +17,89 @@ Dependencies:
     - notebookutils (optional, Fabric environment)
 """
 
+import base64 as _base64
+import functools as _functools
+import importlib as _importlib
+import importlib.util as _importlib_util
+import json as _json
 import logging as _logging
 import re as _re
-import struct as _struct
+import time as _time
+import weakref as _weakref
+from typing import Dict as _Dict, Tuple as _Tuple
 import pyodbc as _pyodbc
 import sqlalchemy as _sa
+from sqlalchemy import create_engine as _create_engine
+from sqlalchemy import event as _event
 
 _logger = _logging.getLogger(__name__)
 
 # Explicitly define public API
 __all__ = [
     "get_fabric_warehouse_engine",
-    "validate_fabric_warehouse_engine"
+    "validate_fabric_warehouse_engine",
+    "dispose_fabric_engines"
 ]
 
 # -----------------------------
 # Handle Fabric-only dependency
 # -----------------------------
-try:
-    from notebookutils import credentials as _default_credentials # type: ignore
-except ImportError:
-    # pylint: disable=R0903
-    class _MockCredentials:
-        # pylint: disable=C0103
-        def getToken(self, resource: str) -> str:
-            """Mocking getToken from mssparkutls"""
-            _logger.warning("Using mock credentials for resource: %s", resource)
-            return "FAKE_TOKEN_FOR_LOCAL_TESTING"
-    _default_credentials = _MockCredentials()
+# pylint: disable=R0903
+class _MockCredentials:
+    # pylint: disable=C0103
+    def getToken(self, resource: str) -> str:
+        """Mocking getToken from mssparkutls"""
+        _logger.warning("Using mock credentials for resource: %s", resource)
+        return "FAKE_TOKEN_FOR_LOCAL_TESTING"
 
 
+@_functools.lru_cache(maxsize=1)
+def _get_default_credentials():
+    # Resolved on first use rather than at import time, so importing this module never
+    # probes for notebookutils and tests can swap the result without reloading.
+    if _importlib_util.find_spec("notebookutils") is None:
+        return _MockCredentials()
+    return _importlib.import_module("notebookutils").credentials
+
+
+_VERSION_RE = _re.compile(r"(\d+)")
+
+_TOKEN_RESOURCE = "https://database.windows.net/"
+_SQL_COPT_SS_ACCESS_TOKEN = 1256
+_TOKEN_DEFAULT_TTL = 50 * 60
+_TOKEN_REFRESH_MARGIN = 5 * 60
+# Pooled connections idle for longer than this are pinged on checkout. Gateways in front of
+# Fabric close sessions that have been idle for about 30 minutes.
+_IDLE_PING_AFTER = 10 * 60
+
+# Packed access tokens per credentials object and resource, with their expiry as epoch seconds.
+# Keyed weakly on the credentials object itself rather than its id(), which CPython reuses for a
+# different object once the original has been garbage-collected.
+_token_cache: _weakref.WeakKeyDictionary = _weakref.WeakKeyDictionary()
+
+# Engines built with the default Fabric credentials, keyed by (sql_endpoint, port, pool_size,
+# max_overflow). The default credentials live for the whole process, so these are held until
+# `dispose_fabric_engines` is called.
+_default_engine_cache: _Dict[tuple, _sa.engine.Engine] = {}
+
+# Engines built with caller-supplied credentials, per credentials object and keyed as above.
+# The engines are held weakly: each one references its credentials to fetch tokens on connect,
+# so holding it strongly would keep both alive forever. An engine is reused for as long as the
+# caller keeps it, and is freed together with its credentials once the caller drops them.
+_engine_cache: _weakref.WeakKeyDictionary = _weakref.WeakKeyDictionary()
+
+
+@_functools.lru_cache(maxsize=1)
 def _get_latest_sql_driver() -> str:
+    # The installed driver set is static for the life of the process, so the
+    # lookup is memoised. Failures are not cached and will be retried.
     drivers = _pyodbc.drivers() # pylint: disable=I1101
     sql_drivers = [d for d in drivers if "SQL Server" in d or "ODBC Driver" in d]
     if not sql_drivers:
         raise RuntimeError("No suitable ODBC driver for SQL Server found.")
 
     def extract_version(name: str) -> int:
-        match = _re.search(r"(\d+)", name)
+        match = _VERSION_RE.search(name)
         return int(match.group(1)) if match else 0
 
     latest_driver = max(sql_drivers, key=extract_version)
@@ -61,19 +107,110 @@ def _get_latest_sql_driver() -> str:
     return latest_driver
 
 
+def _get_token_expiry(token: str) -> float:
+    # Read the `exp` claim from the JWT payload, falling back to a conservative TTL
+    # when the token is not a decodable JWT (e.g. mock credentials).
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(_json.loads(_base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return _time.time() + _TOKEN_DEFAULT_TTL
+
+
+def _pack_token(token: str) -> bytes:
+    encoded = token.encode("UTF-16-LE")
+    # ODBC expects the token as a little-endian 4-byte length prefix followed by the bytes.
+    return len(encoded).to_bytes(4, "little") + encoded
+
+
+def _entries_for(cache: _weakref.WeakKeyDictionary, credentials, factory=dict):
+    try:
+        return cache.setdefault(credentials, factory())
+    except TypeError:
+        # Credentials that cannot be weakly referenced are not cached.
+        return factory()
+
+
+def _get_token_struct(resource: str, credentials) -> bytes:
+    tokens: _Dict[str, _Tuple[bytes, float]] = _entries_for(_token_cache, credentials)
+    cached = tokens.get(resource)
+    if cached is not None and _time.time() < cached[1] - _TOKEN_REFRESH_MARGIN:
+        return cached[0]
+
+    token = credentials.getToken(resource)
+    token_struct = _pack_token(token)
+    tokens[resource] = (token_struct, _get_token_expiry(token))
+    return token_struct
+
+
+def _make_token_provider(credentials):
+    def provide_token(_dialect, _conn_rec, _cargs, cparams):
+        # Runs for every new DBAPI connection, including recycled and overflow ones, so each
+        # login uses a current token rather than the one the engine was created with.
+        token_struct = _get_token_struct(_TOKEN_RESOURCE, credentials)
+        attrs_before = dict(cparams.get("attrs_before", {}))
+        attrs_before[_SQL_COPT_SS_ACCESS_TOKEN] = token_struct
+        cparams["attrs_before"] = attrs_before
+    return provide_token
+
+
+def _record_checkin(_dbapi_connection, connection_record):
+    connection_record.info["checked_in_at"] = _time.monotonic()
+
+
+def _ping_if_idle(dbapi_connection, connection_record, _connection_proxy):
+    # Only connections that have sat in the pool for a while are pinged, so busy workloads do
+    # not pay a round trip per checkout. Raising DisconnectionError makes the pool discard the
+    # dead connection and retry the checkout with a new one.
+    checked_in_at = connection_record.info.get("checked_in_at")
+    if checked_in_at is None or _time.monotonic() - checked_in_at < _IDLE_PING_AFTER:
+        return
+    try:
+        cursor = dbapi_connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.close()
+    except Exception as ex:  # pylint: disable=W0718
+        _logger.info("Discarding idle Fabric connection that failed a ping: %s", ex)
+        raise _sa.exc.DisconnectionError() from ex
+
+
 def get_fabric_warehouse_engine(
         sql_endpoint: str,
         port: int = 1433,
-        credentials=_default_credentials
+        credentials=None,
+        pool_size: int = 10,
+        max_overflow: int = 20
     ) -> _sa.engine.Engine:
     # pylint: disable=C0301
     """
     Create and return a SQLAlchemy engine connected to an Azure Fabric data warehouse.
 
+    Engines are cached per credentials object, endpoint, port and pool settings so that
+    repeated calls share one connection pool. Engines for the default credentials are kept
+    until `dispose_fabric_engines` is called; an engine for caller-supplied credentials is
+    reused while the caller holds a reference to it and is freed with it. The access token is not fixed when the engine
+    is created: every new DBAPI connection fetches it from the credentials' token cache, which
+    refreshes it five minutes before it expires.
+
+    The engine enables pyodbc's `fast_executemany`, so bulk writes such as
+    `DataFrame.to_sql` or `conn.execute(insert(table), rows)` bind parameters as arrays
+    instead of issuing one prepared statement per row.
+
+    Pooled connections are not pinged on every checkout. A connection that has been idle in
+    the pool for more than ten minutes is pinged with `SELECT 1` when it is checked out, and
+    is replaced if the gateway has closed it; connections are also recycled after 58 minutes.
+    The pool hands out the most recently returned connection first so that surplus
+    connections can go idle.
+
     Args:
         sql_endpoint (str): The Fabric SQL endpoint to connect to.
         port (int, optional): The TCP port for the SQL server. Defaults to 1433.
-        credentials (optional): An object with a getToken(resource) method. Defaults to Fabric's credentials.
+        credentials (optional): An object with a getToken(resource) method. Defaults to Fabric's
+            `notebookutils.credentials`, or mock credentials outside Fabric.
+            Tokens are cached per credentials object and refreshed five minutes before they expire.
+        pool_size (int, optional): Number of connections to keep open in the pool. Defaults to 10.
+        max_overflow (int, optional): Number of connections allowed beyond `pool_size`. Defaults to 20.
 
     Returns:
         _sa.engine.Engine: A SQLAlchemy Engine instance connected to the Fabric warehouse.
@@ -90,21 +227,38 @@ def get_fabric_warehouse_engine(
         driver = _get_latest_sql_driver()
         server = f"{sql_endpoint},{port}"
 
-        token = credentials.getToken("https://database.windows.net/").encode("UTF-16-LE")
-        token_struct = _struct.pack(f"<I{len(token)}s", len(token), token)
+        if credentials is None:
+            credentials = _get_default_credentials()
+            engines = _default_engine_cache
+        else:
+            engines = _entries_for(_engine_cache, credentials, _weakref.WeakValueDictionary)
+        # Fetch the token up front so that credential failures surface here, not on first use.
+        _get_token_struct(_TOKEN_RESOURCE, credentials)
+
+        cache_key = (sql_endpoint, port, pool_size, max_overflow)
+        engine = engines.get(cache_key)
+        if engine is not None:
+            _logger.debug("Reusing cached Fabric SQL engine for %s.", server)
+            return engine
 
-        connection_string = f"DRIVER={{{driver}}};SERVER={server}"
         connection_url = _sa.engine.URL.create(
             "mssql+pyodbc",
-            query={"odbc_connect": connection_string}
+            query={"odbc_connect": f"DRIVER={{{driver}}};SERVER={server}"}
         )
 
-        engine = _sa.create_engine(
+        engine = _create_engine(
             connection_url,
-            connect_args={"attrs_before": {1256: token_struct}},
-            pool_pre_ping=True,
-            pool_recycle=3600
+            pool_pre_ping=False,
+            pool_recycle=3480,
+            pool_use_lifo=True,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            fast_executemany=True
         )
+        _event.listen(engine, "do_connect", _make_token_provider(credentials))
+        _event.listen(engine, "checkin", _record_checkin)
+        _event.listen(engine, "checkout", _ping_if_idle)
+        engines[cache_key] = engine
 
         _logger.info("Successfully created Fabric SQL engine.")
         return engine
@@ -138,3 +292,17 @@ def validate_fabric_warehouse_engine(engine: _sa.engine.Engine) -> bool:
     except Exception as ex:
         _logger.error("Test query failed: %s", ex, exc_info=True)
         raise
+
+
+def dispose_fabric_engines() -> None:
+    """
+    Dispose of every cached Fabric warehouse engine and clear the engine cache.
+
+    Subsequent calls to `get_fabric_warehouse_engine` will create new engines. Useful in
+    test fixtures and when a notebook needs to drop all pooled connections.
+    """
+    for engines in [_default_engine_cache, *_engine_cache.values()]:
+        for engine in list(engines.values()):
+            engine.dispose()
+    _default_engine_cache.clear()
+    _engine_cache.clear()
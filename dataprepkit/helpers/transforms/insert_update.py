@@ -9,11 +9,15 @@ Functions included:
 - `create_table_from_existing_table_schema`: Clone a table's schema and optionally add a surrogate key.
 - `validate_table_uniqueness`: Check for duplicate business keys in a table.
 - `validate_table_no_nulls`: Ensure no NULLs exist in specified business key columns.
+- `validate_table_keys`: Check business keys for NULLs and duplicates in a single pass.
+- `validate_table_uniqueness_batch`: Check several business key sets for duplicates in one query.
 - `insert_new_records_dynamic`: Insert new records based on business key uniqueness, generating surrogate keys.
 - `update_records_tsql`: Update target records with columns from a source table using join keys.
+- `merge_records_tsql`: Update matched and insert unmatched target records in a single T-SQL `MERGE`.
 
 Private helpers include:
 - `_parse_qualified_table`: Parses a string table name in formats like '[schema].[table]' or '[table]'.
+- `_quote_identifier`: Bracket-quotes a column name, escaping any closing bracket.
 - `_make_qualified_table_name`: Rebuilds a SQL-compliant table name string.
 - `_table_exists`: Checks whether a table exists in the connected database.
 - `_is_table_empty`: Returns True if a table has no rows.
@@ -31,7 +35,7 @@ and data deduplication are necessary before inserts or updates.
 
 import re
 import logging
-from typing import List, Union, Optional, Dict
+from typing import List, Union, Optional, Dict, Tuple
 from sqlalchemy import Table, MetaData, Column, Integer
 from sqlalchemy.engine import Engine
 from sqlalchemy import inspect, text
@@ -40,29 +44,43 @@ __all__ = [
     "create_table_from_existing_table_schema",
     "validate_table_uniqueness",
     "validate_table_no_nulls",
+    "validate_table_keys",
+    "validate_table_uniqueness_batch",
     "insert_new_records_dynamic",
     "update_records_tsql",
+    "merge_records_tsql",
 ]
 
 logger = logging.getLogger(__name__)
 
 
+# Support format: [schema].[table]
+_QUALIFIED_TABLE_RE = re.compile(r"^\[(?P<schema>[^\]]+)\]\.\[(?P<table>[^\]]+)\]$")
+# Support simple table name with no schema
+_SIMPLE_TABLE_RE = re.compile(r"^\[?(?P<table>\w+)\]?$")
+
+
 def _parse_qualified_table(qname: str):
-    # Support format: [schema].[table]
-    pattern = r"^\[(?P<schema>[^\]]+)\]\.\[(?P<table>[^\]]+)\]$"
-    match = re.match(pattern, qname)
+    match = _QUALIFIED_TABLE_RE.match(qname)
     if match:
         return match.group("schema"), match.group("table")
 
-    # Support simple table name with no schema
-    simple_pattern = r"^\[?(?P<table>\w+)\]?$"
-    match = re.match(simple_pattern, qname)
+    match = _SIMPLE_TABLE_RE.match(qname)
     if match:
         return None, match.group("table")
 
     raise ValueError(f"Table name '{qname}' is not in the format [schema].[table] or [table]")
 
 
+def _quote_identifier(name: str) -> str:
+    # Column names cannot be bound as parameters, so they are bracket-quoted with any closing
+    # bracket doubled. Names such as "Company Code" or "Cost-Centre" stay usable, and a name
+    # cannot end the quoted identifier early.
+    if not isinstance(name, str) or not name or "\x00" in name:
+        raise ValueError(f"Invalid column name: {name!r}")
+    return f"[{name.replace(']', ']]')}]"
+
+
 def _make_qualified_table_name(schema: Optional[str], table: str) -> str:
     return f"[{schema}].[{table}]" if schema else f"[{table}]"
 
@@ -83,7 +101,7 @@ def _is_table_empty(engine: Engine, qualified_table: str) -> bool:
 
 
 def _add_surrogate_key_column(engine: Engine, qualified_table: str, surrogate_key: str) -> None:
-    alter_sql = f"ALTER TABLE {qualified_table} ADD {surrogate_key} INT;"
+    alter_sql = f"ALTER TABLE {qualified_table} ADD {_quote_identifier(surrogate_key)} INT;"
     with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
         conn.execute(text(alter_sql))
     logger.info("Added surrogate key column '%s' to '%s'.", surrogate_key, qualified_table)
@@ -98,18 +116,18 @@ def _generate_insert_sql(
     start_id: int = 100
 ) -> str:
     insert_columns = [surrogate_key] + common_columns
-    insert_cols_str = ', '.join(f"[{col}]" for col in insert_columns)
-    select_cols_str = ', '.join(f"src.[{col}]" for col in common_columns)
+    insert_cols_str = ', '.join(_quote_identifier(col) for col in insert_columns)
+    select_cols_str = ', '.join(f"src.{_quote_identifier(col)}" for col in common_columns)
 
-    join_condition = ' AND '.join(f"src.[{key}] = tgt.[{key}]" for key in business_keys)
-    null_condition = ' AND '.join(f"tgt.[{key}] IS NULL" for key in business_keys)
+    join_condition = ' AND '.join(f"src.{_quote_identifier(key)} = tgt.{_quote_identifier(key)}" for key in business_keys)
+    null_condition = ' AND '.join(f"tgt.{_quote_identifier(key)} IS NULL" for key in business_keys)
 
     return f"""
         INSERT INTO {qualified_target} (
             {insert_cols_str}
         )
         SELECT
-            {start_id} + ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS [{surrogate_key}],
+            {start_id} + ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS {_quote_identifier(surrogate_key)},
             {select_cols_str}
         FROM {qualified_source} src
         LEFT JOIN {qualified_target} tgt
@@ -332,6 +350,7 @@ def validate_table_uniqueness(
 
     This function checks for duplicate rows based on the provided business key columns.
     If any duplicates are found, it raises a `ValueError` and includes a sample of the duplicate keys.
+    Only the first five duplicate groups are fetched from the database.
 
     Parameters
     ----------
@@ -349,7 +368,7 @@ def validate_table_uniqueness(
     Raises
     ------
     ValueError
-        If duplicate combinations of the business key columns are found in the table.
+        If `business_keys` is empty or duplicate combinations of the key columns are found.
 
     Example
     -------
@@ -360,17 +379,7 @@ def validate_table_uniqueness(
     # ValueError: Duplicate business keys found in table: [('123', 'US'), ('456', 'CA')]...
     """
 
-    with engine.connect() as conn:
-        key_expr = ', '.join(f"[{k}]" for k in business_keys)
-        sql = f"""
-            SELECT {key_expr}, COUNT(*) as cnt
-            FROM {qualified_source}
-            GROUP BY {key_expr}
-            HAVING COUNT(*) > 1;
-        """
-        result = conn.execute(text(sql)).fetchall()
-        if result:
-            raise ValueError(f"Duplicate business keys found in table: {result[:5]}...")
+    _validate_business_keys(engine, qualified_source, business_keys, check_nulls=False)
 
 
 def validate_table_no_nulls(engine: Engine, qualified_table: str, business_keys: List[str]) -> None:
@@ -397,7 +406,7 @@ def validate_table_no_nulls(engine: Engine, qualified_table: str, business_keys:
     Raises
     ------
     ValueError
-        If any rows contain NULL values in one or more of the specified business key columns.
+        If `business_keys` is empty or any rows contain NULLs in the business key columns.
 
     Example
     -------
@@ -407,21 +416,184 @@ def validate_table_no_nulls(engine: Engine, qualified_table: str, business_keys:
     # If NULLs are present, raises ValueError with details
     """
 
+    _validate_business_keys(engine, qualified_table, business_keys, check_duplicates=False)
+
+def validate_table_keys(engine: Engine, qualified_table: str, business_keys: List[str]) -> None:
+    """
+    Validates that the specified business key columns contain no NULLs and form a unique key.
+
+    Both checks are evaluated in a single query over the table, grouping by the business
+    keys once and counting the rows in groups with a NULL key and in groups occurring more
+    than once. This replaces separate calls to `validate_table_no_nulls` and
+    `validate_table_uniqueness`, which each scan the table.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine connected to the database.
+    qualified_table : str
+        Fully qualified table name in the format `[schema].[table]`.
+    business_keys : List[str]
+        List of column names that should be non-NULL and unique across the table.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If `business_keys` is empty, or if any rows contain NULL business keys or duplicate
+        business key combinations. The message reports both counts when both checks fail.
+
+    Example
+    -------
+    >>> from sqlalchemy import create_engine
+    >>> engine = create_engine("mssql+pyodbc://my_dsn")
+    >>> validate_table_keys(engine, "[dbo].[customers]", ["CustomerId", "RegionCode"])
+    # If NULLs or duplicates are present, raises ValueError with details
+    """
+
+    _validate_business_keys(engine, qualified_table, business_keys)
+
+
+def validate_table_uniqueness_batch(
+        engine: Engine,
+        qualified_table: str,
+        key_sets: List[List[str]]) -> None:
+    # pylint: disable=C0301
+    """
+    Validates that each of several business key sets forms a unique constraint in the table.
+
+    The duplicate check for every key set is combined into a single statement with
+    `UNION ALL`, returning one count of duplicate groups per key set. This replaces one
+    `validate_table_uniqueness` call, and one round trip, per key set.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine connected to the database.
+    qualified_table : str
+        Fully qualified table name in the format `[schema].[table]`.
+    key_sets : List[List[str]]
+        List of business key column lists, each of which should be unique across the table.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    ValueError
+        If `key_sets` or any key set in it is empty, or if duplicate combinations are found
+        for any key set.
+        The message lists every violating key set.
+
+    Example
+    -------
+    >>> from sqlalchemy import create_engine
+    >>> engine = create_engine("mssql+pyodbc://my_dsn")
+    >>> validate_table_uniqueness_batch(engine, "[dbo].[customers]", [["CustomerId"], ["Email", "RegionCode"]])
+    # If duplicates exist, raises ValueError like:
+    # ValueError: Duplicate business keys found in table '[dbo].[customers]' for key set(s): ['CustomerId'] (2 groups)
+    """
+
+    if not key_sets:
+        raise ValueError("At least one business key set must be provided.")
+
+    selects = []
+    for i, keys in enumerate(key_sets):
+        if not keys:
+            raise ValueError(f"Business key set {i} is empty; each key set needs at least one column.")
+        key_expr = ', '.join(_quote_identifier(k) for k in keys)
+        selects.append(f"""
+                SELECT {i} AS key_set, COUNT(*) AS duplicate_groups
+                FROM (
+                    SELECT {key_expr}
+                    FROM {qualified_table}
+                    GROUP BY {key_expr}
+                    HAVING COUNT(*) > 1
+                ) dup_{i}""")
+    sql = "\n                UNION ALL".join(selects) + ";"
+
     with engine.connect() as conn:
-        null_conditions = ' OR '.join(f"[{key}] IS NULL" for key in business_keys)
-        sql = f"""
-            SELECT COUNT(*) AS null_count
-            FROM {qualified_table}
-            WHERE {null_conditions};
-        """
-        result = conn.execute(text(sql)).fetchone()
-        assert result is not None
-        if result.null_count > 0:
-            raise ValueError(
-                # pylint: disable=C0301
-                f"Found {result.null_count} rows with NULL values in business key(s) {business_keys} "
-                f"in table '{qualified_table}'."
-            )
+        rows = conn.execute(text(sql)).fetchall()
+
+    violations = [
+        f"{key_sets[row.key_set]} ({row.duplicate_groups} groups)"
+        for row in sorted(rows, key=lambda r: r.key_set)
+        if row.duplicate_groups > 0
+    ]
+    if violations:
+        raise ValueError(
+            f"Duplicate business keys found in table '{qualified_table}' "
+            f"for key set(s): {', '.join(violations)}"
+        )
+
+
+def _validate_business_keys(
+    engine: Engine,
+    qualified_table: str,
+    business_keys: List[str],
+    check_nulls: bool = True,
+    check_duplicates: bool = True
+) -> None:
+    # Shared implementation of the key validators. Each combination of checks is answered
+    # by one query: a filtered COUNT for NULLs only, a GROUP BY ... HAVING sample for
+    # duplicates only, or a single grouped pass that counts both. Only the scalar or
+    # single row needed is read back from each result.
+    if not business_keys:
+        raise ValueError("At least one business key must be provided.")
+    quoted_keys = [_quote_identifier(k) for k in business_keys]
+    key_expr = ', '.join(quoted_keys)
+    any_null = ' OR '.join(f"{k} IS NULL" for k in quoted_keys)
+
+    with engine.connect() as conn:
+        if not check_nulls:
+            sql = f"""
+                SELECT {key_expr}, COUNT(*) AS row_count
+                FROM {qualified_table}
+                GROUP BY {key_expr}
+                HAVING COUNT(*) > 1;
+            """
+            duplicates = conn.execute(text(sql)).fetchmany(5)
+            if duplicates:
+                raise ValueError(f"Duplicate business keys found in table: {duplicates}...")
+            return
+
+        if not check_duplicates:
+            sql = f"""
+                SELECT COUNT(*)
+                FROM {qualified_table}
+                WHERE {any_null};
+            """
+            null_count, duplicate_count = conn.execute(text(sql)).scalar_one(), 0
+        else:
+            # The derived table exposes only generated names (key_0, ..., row_count), so the
+            # outer query cannot bind to a business key column that shares one of them.
+            grouped_null = ' OR '.join(f"key_{i} IS NULL" for i in range(len(quoted_keys)))
+            sql = f"""
+                SELECT
+                    COALESCE(SUM(CASE WHEN {grouped_null} THEN row_count ELSE 0 END), 0) AS null_count,
+                    COALESCE(SUM(CASE WHEN NOT ({grouped_null}) AND row_count > 1 THEN row_count ELSE 0 END), 0) AS duplicate_count
+                FROM (
+                    SELECT {', '.join(f"{k} AS key_{i}" for i, k in enumerate(quoted_keys))}, COUNT(*) AS row_count
+                    FROM {qualified_table}
+                    GROUP BY {key_expr}
+                ) grouped;
+            """
+            null_count, duplicate_count = conn.execute(text(sql)).one()
+
+    problems = []
+    if null_count > 0:
+        problems.append(f"{null_count} rows with NULL values")
+    if duplicate_count > 0:
+        problems.append(f"{duplicate_count} rows with duplicate values")
+    if problems:
+        raise ValueError(
+            f"Found {' and '.join(problems)} in business key(s) {business_keys} "
+            f"in table '{qualified_table}'."
+        )
 
 def insert_new_records_dynamic(
     engine: Engine,
@@ -560,7 +732,7 @@ def _get_max_surrogate_key(
     default_start_id: int
 ) -> int:
     with engine.connect() as conn:
-        max_id_result = conn.execute(text(f"SELECT MAX([{surrogate_key}]) AS max_id FROM {qualified_target}")).fetchone()
+        max_id_result = conn.execute(text(f"SELECT MAX({_quote_identifier(surrogate_key)}) AS max_id FROM {qualified_target}")).fetchone()
         assert max_id_result is not None
         return max_id_result.max_id if max_id_result.max_id is not None else default_start_id
 
@@ -576,16 +748,21 @@ def update_records_tsql(
     source_table: str,
     join_keys: Union[str, List[str]],
     surrogate_key: str,
-    columns_to_update: List[str]
-) -> int:
+    columns_to_update: List[str],
+    return_changed_keys: bool = False
+) -> Union[int, Tuple[int, List]]:
     # pylint: disable=C0301
     """
     Updates records in the target table using matching rows from the source table,
     based on the specified join keys. Only rows with a non-null surrogate key in
-    the target table are updated.
+    the target table are updated, and rows whose `columns_to_update` already equal
+    the source values (NULL-safe) are skipped so unchanged rows are not rewritten.
 
     This function generates and executes a T-SQL `UPDATE ... FROM` statement,
-    which performs a set-based update on multiple columns.
+    which performs a set-based update on multiple columns. When `return_changed_keys`
+    is set, the `UPDATE` also returns the surrogate keys of the updated rows through an
+    `OUTPUT inserted.<surrogate_key>` clause, so auditing does not need a second scan of
+    the target table.
 
     Parameters
     ----------
@@ -601,11 +778,14 @@ def update_records_tsql(
         Name of the surrogate key column; only rows with a non-null surrogate key in the target are updated.
     columns_to_update : List[str]
         List of column names to update in the target table from the source table.
+    return_changed_keys : bool, optional
+        If True, also return the surrogate keys of the updated rows. Defaults to False.
 
     Returns
     -------
-    int
-        The number of rows updated in the target table.
+    int or Tuple[int, List]
+        The number of rows updated in the target table, or a tuple of that count and the
+        list of updated surrogate keys when `return_changed_keys` is True.
 
     Raises
     ------
@@ -644,9 +824,14 @@ def update_records_tsql(
         qualified_source=qualified_source,
         set_clause=set_clause,
         join_condition=join_condition,
-        surrogate_key=surrogate_key
+        surrogate_key=surrogate_key,
+        change_predicate=_build_change_predicate(columns_to_update),
+        output_clause=f"OUTPUT inserted.{_quote_identifier(surrogate_key)}" if return_changed_keys else ""
     )
 
+    if return_changed_keys:
+        return _execute_update_returning_keys(engine, tsql, qualified_target)
+
     return _execute_update(engine, tsql, qualified_target)
 
 
@@ -655,12 +840,19 @@ def _get_qualified_table(table_name: str) -> str:
     return _make_qualified_table_name(schema, tbl)
 
 
-def _build_set_clause(columns: List[str]) -> str:
-    return ",\n    ".join(f"tgt.[{col}] = src.[{col}]" for col in columns)
+def _build_set_clause(columns: List[str], indent: str = "    ") -> str:
+    return f",\n{indent}".join(f"tgt.{_quote_identifier(col)} = src.{_quote_identifier(col)}" for col in columns)
 
 
 def _build_join_condition(join_keys: List[str]) -> str:
-    return " AND ".join(f"tgt.[{key}] = src.[{key}]" for key in join_keys)
+    return " AND ".join(f"tgt.{_quote_identifier(key)} = src.{_quote_identifier(key)}" for key in join_keys)
+
+
+def _build_change_predicate(columns: List[str]) -> str:
+    # EXCEPT compares NULLs as equal, so this is true only when at least one column differs.
+    src_cols = ", ".join(f"src.{_quote_identifier(col)}" for col in columns)
+    tgt_cols = ", ".join(f"tgt.{_quote_identifier(col)}" for col in columns)
+    return f"EXISTS (SELECT {src_cols} EXCEPT SELECT {tgt_cols})"
 
 
 def _build_update_tsql(
@@ -668,16 +860,20 @@ def _build_update_tsql(
     qualified_source: str,
     set_clause: str,
     join_condition: str,
-    surrogate_key: str
+    surrogate_key: str,
+    change_predicate: str,
+    output_clause: str = ""
 ) -> str:
+    output_line = f"\n    {output_clause}" if output_clause else ""
     return f"""
     UPDATE tgt
     SET
-        {set_clause}
+        {set_clause}{output_line}
     FROM {qualified_target} tgt
     INNER JOIN {qualified_source} src
         ON {join_condition}
-    WHERE tgt.[{surrogate_key}] IS NOT NULL;
+    WHERE tgt.{_quote_identifier(surrogate_key)} IS NOT NULL
+        AND {change_predicate};
     """
 
 
@@ -686,3 +882,116 @@ def _execute_update(engine: Engine, tsql: str, qualified_target: str) -> int:
         result = conn.execute(text(tsql))
         logger.info("Updated %s rows in %s.", result.rowcount, qualified_target)
         return result.rowcount
+
+
+def _execute_update_returning_keys(engine: Engine, tsql: str, qualified_target: str) -> Tuple[int, List]:
+    with engine.begin() as conn:
+        changed_keys = [row[0] for row in conn.execute(text(tsql)).fetchall()]
+        logger.info("Updated %s rows in %s.", len(changed_keys), qualified_target)
+        return len(changed_keys), changed_keys
+
+
+def merge_records_tsql(
+    engine: Engine,
+    target_table: str,
+    source_table: str,
+    join_keys: Union[str, List[str]],
+    columns_to_update: List[str],
+    columns_to_insert: List[str]
+) -> int:
+    # pylint: disable=C0301
+    """
+    Synchronises the target table with the source table in a single T-SQL `MERGE` statement.
+
+    Target rows matching a source row on the join keys are updated when at least one of
+    `columns_to_update` differs (NULL-safe), and source rows with no match in the target
+    are inserted. Both branches are processed in one pass over the
+    tables instead of a separate `UPDATE` and `INSERT`. The target is locked with
+    `WITH (TABLOCK, HOLDLOCK)` so concurrent writers cannot insert a matching row mid-merge.
+
+    Parameters
+    ----------
+    engine : Engine
+        SQLAlchemy engine connected to the target database.
+    target_table : str
+        Fully-qualified or unqualified target table name in the format `[schema].[table]` or `[table]`.
+    source_table : str
+        Fully-qualified or unqualified source table name in the format `[schema].[table]` or `[table]`.
+    join_keys : str or List[str]
+        One or more column names used to match source and target rows.
+    columns_to_update : List[str]
+        Columns to update on matched rows. If empty, the `WHEN MATCHED` branch is omitted.
+    columns_to_insert : List[str]
+        Columns to insert for unmatched source rows. If empty, the `WHEN NOT MATCHED` branch is omitted.
+
+    Returns
+    -------
+    int
+        The number of rows updated or inserted in the target table.
+
+    Raises
+    ------
+    ValueError
+        If both `columns_to_update` and `columns_to_insert` are empty.
+
+    Example
+    -------
+    >>> from sqlalchemy import create_engine
+    >>> engine = create_engine("mssql+pyodbc://my_dsn")
+    >>> rows_merged = merge_records_tsql(
+    ...     engine=engine,
+    ...     target_table="[dbo].[target]",
+    ...     source_table="[staging].[source]",
+    ...     join_keys=["business_id"],
+    ...     columns_to_update=["col1", "col2"],
+    ...     columns_to_insert=["business_id", "col1", "col2"]
+    ... )
+    >>> print(f"{rows_merged} rows merged.")
+    """
+
+    if isinstance(join_keys, str):
+        join_keys = [join_keys]
+
+    if not columns_to_update and not columns_to_insert:
+        raise ValueError("At least one of `columns_to_update` or `columns_to_insert` must be non-empty.")
+
+    qualified_target = _get_qualified_table(target_table)
+    qualified_source = _get_qualified_table(source_table)
+
+    tsql = _build_merge_tsql(
+        qualified_target=qualified_target,
+        qualified_source=qualified_source,
+        join_condition=_build_join_condition(join_keys),
+        columns_to_update=columns_to_update,
+        columns_to_insert=columns_to_insert
+    )
+
+    with engine.begin() as conn:
+        result = conn.execute(text(tsql))
+        logger.info("Merged %s rows into %s.", result.rowcount, qualified_target)
+        return result.rowcount
+
+
+def _build_merge_tsql(
+    qualified_target: str,
+    qualified_source: str,
+    join_condition: str,
+    columns_to_update: List[str],
+    columns_to_insert: List[str]
+) -> str:
+    parts = [
+        f"MERGE {qualified_target} WITH (TABLOCK, HOLDLOCK) AS tgt",
+        f"USING {qualified_source} AS src",
+        f"    ON {join_condition}",
+    ]
+    if columns_to_update:
+        set_clause = _build_set_clause(columns_to_update, indent="        ")
+        parts.append(f"WHEN MATCHED AND {_build_change_predicate(columns_to_update)} THEN")
+        parts.append(f"    UPDATE SET\n        {set_clause}")
+    if columns_to_insert:
+        insert_cols = ", ".join(_quote_identifier(col) for col in columns_to_insert)
+        values_cols = ", ".join(f"src.{_quote_identifier(col)}" for col in columns_to_insert)
+        parts.append("WHEN NOT MATCHED BY TARGET THEN")
+        parts.append(f"    INSERT ({insert_cols})")
+        parts.append(f"    VALUES ({values_cols})")
+    return "\n".join(parts) + ";"
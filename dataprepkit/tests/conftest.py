@@ -0,0 +1,65 @@
+"""
+Shared fixtures for the dataprepkit test suite.
+
+`FakeEngine` and `FakeConn` stand in for a SQLAlchemy engine and connection in tests
+that only need to capture the executed SQL and return a canned result. They are plain
+classes rather than `MagicMock` chains, so they are cheap to build for every test.
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeConn:
+    """
+    Records every statement passed to `execute` and returns a result carrying the
+    configured `rowcount`, `scalar()`/`scalar_one()` value and `fetchall()` rows.
+    """
+
+    def __init__(self, rowcount=0, scalar=None, rows=()):
+        self.sql = []
+        self.rowcount = rowcount
+        self.scalar_value = scalar
+        self.rows = list(rows)
+
+    def execute(self, statement, *_args, **_kwargs):
+        self.sql.append(statement)
+        return SimpleNamespace(
+            rowcount=self.rowcount,
+            scalar=lambda: self.scalar_value,
+            scalar_one=lambda: self.scalar_value,
+            fetchall=lambda: list(self.rows)
+        )
+
+
+class FakeEngine:
+    """
+    Hands out the same `FakeConn` from both `begin()` and `connect()`.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.disposed = False
+
+    @contextmanager
+    def begin(self):
+        yield self.conn
+
+    @contextmanager
+    def connect(self):
+        yield self.conn
+
+    def dispose(self):
+        self.disposed = True
+
+
+@pytest.fixture
+def fake_engine():
+    """
+    Yield a `(engine, conn)` pair of fakes; set `conn.rowcount`, `conn.scalar_value` or `conn.rows`
+    to control what the executed statement returns.
+    """
+    conn = FakeConn()
+    yield FakeEngine(conn), conn
@@ -0,0 +1,37 @@
+"""
+Shared fixtures for the Fabric warehouse connector tests.
+"""
+
+from unittest.mock import patch
+import pytest
+
+from dataprepkit.helpers.connectors import warehouse
+
+
+@pytest.fixture(autouse=True)
+def _clear_warehouse_caches():
+    """
+    Clear the module-level caches in the warehouse connector so that patched
+    `pyodbc.drivers` values, mock credentials and mock engines are picked up by every test.
+    """
+    # pylint: disable=protected-access
+    warehouse._get_latest_sql_driver.cache_clear()
+    warehouse._get_default_credentials.cache_clear()
+    warehouse._token_cache.clear()
+    warehouse.dispose_fabric_engines()
+    yield
+    warehouse._get_latest_sql_driver.cache_clear()
+    warehouse._get_default_credentials.cache_clear()
+    warehouse._token_cache.clear()
+    warehouse.dispose_fabric_engines()
+
+
+@pytest.fixture(autouse=True)
+def mock_event():
+    """
+    Patch the SQLAlchemy event API used by the warehouse connector, since mocked engines
+    cannot take real listeners. Tests can request this fixture to get at the registered
+    `do_connect` handlers.
+    """
+    with patch("dataprepkit.helpers.connectors.warehouse._event") as mocked:
+        yield mocked
@@ -10,47 +10,75 @@ Mocking is used to isolate the test environment from real network, authenticatio
 and database dependencies, ensuring fast and deterministic tests.
 """
 
+import base64
+import gc
+import json
 import struct
+import time
+import weakref
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 import pytest
 import sqlalchemy as sa
 
-from dataprepkit.helpers.connectors.warehouse import get_fabric_warehouse_engine
+from dataprepkit.helpers.connectors import warehouse
+from dataprepkit.helpers.connectors.warehouse import get_fabric_warehouse_engine, _pack_token
+
+# Spec shared by every mocked engine in this module
+_ENGINE_SPEC = sa.engine.Engine
+
+
+def _listener(mock_event, event_name, engine_index=-1):
+    # Return the handler registered for an event on the engine_index-th engine created.
+    handlers = [call[0][2] for call in mock_event.listen.call_args_list if call[0][1] == event_name]
+    return handlers[engine_index]
+
+
+def _connect_token(mock_event, engine_index=-1):
+    # Run the do_connect handler registered for an engine and return the token it sets.
+    provide_token = _listener(mock_event, "do_connect", engine_index)
+    cparams = {}
+    provide_token(None, None, [], cparams)
+    return cparams["attrs_before"][1256]
 
 
-@pytest.mark.parametrize("endpoint, port", [
-    ("myfabric.warehouse.microsoft.com", 1433),
-    ("myfabric.warehouse.microsoft.com", 1444),
-])
 @patch("pyodbc.drivers", return_value=[
     "ODBC Driver 13 for SQL Server",
     "ODBC Driver 18 for SQL Server",
 ])
-@patch("sqlalchemy.create_engine")
-def test_get_fabric_warehouse_engine_success(mock_create_engine, _mock_drivers, endpoint, port):
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_success(mock_create_engine, _mock_drivers, mock_event):
     """
     Test that a SQLAlchemy engine is successfully created using valid credentials,
     a proper ODBC driver, and the provided Fabric SQL endpoint and port.
     Verifies the structure of token-based connection arguments.
     """
+    endpoint = "myfabric.warehouse.microsoft.com"
     token = "mocked_token".encode("UTF-16-LE")
     token_struct = struct.pack(f"<I{len(token)}s", len(token), token)
 
-    mock_engine = MagicMock(spec=sa.engine.Engine)
+    mock_engine = MagicMock(spec=_ENGINE_SPEC)
     mock_create_engine.return_value = mock_engine
 
     mock_credentials = MagicMock()
     mock_credentials.getToken.return_value = "mocked_token"
 
-    engine = get_fabric_warehouse_engine(endpoint, port, credentials=mock_credentials)
+    # The port only affects the connection string, so both ports share one mock setup
+    assert get_fabric_warehouse_engine(endpoint, 1433, credentials=mock_credentials) == mock_engine
+    assert get_fabric_warehouse_engine(endpoint, 1444, credentials=mock_credentials) == mock_engine
 
-    assert engine == mock_engine
     mock_credentials.getToken.assert_called_once_with('https://database.windows.net/')
-    connect_args = mock_create_engine.call_args[1]["connect_args"]
-    assert 1256 in connect_args["attrs_before"]
-    assert connect_args["attrs_before"][1256] == token_struct
-    assert mock_create_engine.call_args[1]["pool_recycle"] == 3600
-    assert mock_create_engine.call_args[1]["pool_pre_ping"] is True
+    first_call, second_call = mock_create_engine.call_args_list
+    assert f"{endpoint},1433" in first_call[0][0].query["odbc_connect"]
+    assert f"{endpoint},1444" in second_call[0][0].query["odbc_connect"]
+
+    kwargs = second_call[1]
+    assert "connect_args" not in kwargs
+    assert _connect_token(mock_event) == token_struct
+    assert kwargs["pool_recycle"] == 3480
+    assert kwargs["pool_pre_ping"] is False
+    assert kwargs["pool_use_lifo"] is True
+    assert kwargs["fast_executemany"] is True
 
 
 def test_get_fabric_warehouse_engine_empty_endpoint_raises():
@@ -83,3 +111,224 @@ def test_get_fabric_warehouse_engine_token_failure(_mock_drivers):
     mock_credentials.getToken.side_effect = Exception("Token error")
     with pytest.raises(Exception, match="Token error"):
         get_fabric_warehouse_engine("some.endpoint", credentials=mock_credentials)
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_caches_driver_lookup(_mock_create_engine, mock_drivers):
+    """
+    Test that the installed ODBC drivers are only enumerated once across
+    repeated engine creations in the same process.
+    """
+    mock_credentials = MagicMock()
+    mock_credentials.getToken.return_value = "mocked_token"
+
+    get_fabric_warehouse_engine("some.endpoint", 1433, credentials=mock_credentials)
+    get_fabric_warehouse_engine("some.endpoint", 1444, credentials=mock_credentials)
+
+    mock_drivers.assert_called_once()
+
+
+def _make_jwt(exp: float) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+@pytest.mark.parametrize("lifetime, expected_calls", [
+    (3600, 1),  # valid token is reused
+    (60, 2),    # token inside the refresh margin is fetched again
+])
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_caches_token(_mock_create_engine, _mock_drivers, lifetime, expected_calls):
+    """
+    Test that the access token is reused across engine creations until it is
+    within the refresh margin of the `exp` claim in the JWT.
+    """
+    mock_credentials = MagicMock()
+    mock_credentials.getToken.return_value = _make_jwt(time.time() + lifetime)
+
+    get_fabric_warehouse_engine("some.endpoint", 1433, credentials=mock_credentials)
+    get_fabric_warehouse_engine("some.endpoint", 1444, credentials=mock_credentials)
+
+    assert mock_credentials.getToken.call_count == expected_calls
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_reuses_cached_engine(mock_create_engine, _mock_drivers):
+    """
+    Test that repeated calls for the same endpoint and port return the same engine,
+    even after the access token has been rotated.
+    """
+    mock_engine = MagicMock(spec=_ENGINE_SPEC)
+    mock_create_engine.return_value = mock_engine
+
+    mock_credentials = MagicMock()
+    mock_credentials.getToken.return_value = "mocked_token"
+    assert get_fabric_warehouse_engine("some.endpoint", credentials=mock_credentials) is mock_engine
+
+    # Expire the cached token so the same credentials return a rotated one
+    warehouse._token_cache.clear() # pylint: disable=protected-access
+    mock_credentials.getToken.return_value = "rotated_token"
+    assert get_fabric_warehouse_engine("some.endpoint", credentials=mock_credentials) is mock_engine
+
+    assert mock_create_engine.call_count == 1
+    mock_engine.dispose.assert_not_called()
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_new_connections_get_fresh_token(_mock_create_engine, _mock_drivers, mock_event):
+    """
+    Test that each new connection, such as a recycled or overflow one, logs in with the
+    current token rather than the token the engine was created with.
+    """
+    mock_credentials = MagicMock()
+    # The first token is already inside the refresh margin when the engine is created
+    mock_credentials.getToken.return_value = _make_jwt(time.time() + 60)
+    get_fabric_warehouse_engine("some.endpoint", credentials=mock_credentials)
+
+    rotated = _make_jwt(time.time() + 3600)
+    mock_credentials.getToken.return_value = rotated
+    assert _connect_token(mock_event) == _pack_token(rotated)
+    assert _connect_token(mock_event) == _pack_token(rotated)
+    assert mock_credentials.getToken.call_count == 2
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_pool_options(mock_create_engine, _mock_drivers):
+    """
+    Test that the pool sizing parameters are passed to the engine, alongside LIFO
+    pooling, so warehouse-heavy jobs can tune them.
+    """
+    mock_credentials = MagicMock()
+    mock_credentials.getToken.return_value = "mocked_token"
+
+    get_fabric_warehouse_engine(
+        "some.endpoint",
+        credentials=mock_credentials,
+        pool_size=5,
+        max_overflow=10
+    )
+
+    kwargs = mock_create_engine.call_args[1]
+    assert kwargs["pool_size"] == 5
+    assert kwargs["max_overflow"] == 10
+    assert kwargs["pool_use_lifo"] is True
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_pings_only_idle_connections(_mock_create_engine, _mock_drivers, mock_event):
+    """
+    Test that a connection is pinged on checkout only after it has been idle in the pool
+    for longer than the ping threshold.
+    """
+    get_fabric_warehouse_engine("some.endpoint", credentials=MagicMock())
+    record_checkin = _listener(mock_event, "checkin")
+    ping_if_idle = _listener(mock_event, "checkout")
+    dbapi_connection = MagicMock()
+    connection_record = SimpleNamespace(info={})
+
+    ping_if_idle(dbapi_connection, connection_record, None)
+    record_checkin(dbapi_connection, connection_record)
+    ping_if_idle(dbapi_connection, connection_record, None)
+    dbapi_connection.cursor.assert_not_called()
+
+    connection_record.info["checked_in_at"] -= warehouse._IDLE_PING_AFTER + 1 # pylint: disable=protected-access
+    ping_if_idle(dbapi_connection, connection_record, None)
+    dbapi_connection.cursor.return_value.execute.assert_called_once_with("SELECT 1")
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_discards_dead_idle_connections(_mock_create_engine, _mock_drivers, mock_event):
+    """
+    Test that an idle connection closed by the gateway raises DisconnectionError on
+    checkout, so the pool replaces it instead of handing it to the caller.
+    """
+    get_fabric_warehouse_engine("some.endpoint", credentials=MagicMock())
+    ping_if_idle = _listener(mock_event, "checkout")
+    dbapi_connection = MagicMock()
+    dbapi_connection.cursor.return_value.execute.side_effect = RuntimeError("Communication link failure")
+    connection_record = SimpleNamespace(info={"checked_in_at": time.monotonic() - 3600})
+
+    with pytest.raises(sa.exc.DisconnectionError):
+        ping_if_idle(dbapi_connection, connection_record, None)
+
+
+def test_pack_token_prefixes_length():
+    """
+    Test that a token is packed as a little-endian length prefix followed by its UTF-16-LE bytes.
+    """
+    encoded = "mocked_token".encode("UTF-16-LE")
+    assert _pack_token("mocked_token") == struct.pack(f"<I{len(encoded)}s", len(encoded), encoded)
+
+
+class _ShortLivedCredentials:
+    # pylint: disable=C0103, R0903
+    def __init__(self, token):
+        self.token = token
+
+    def getToken(self, _resource):
+        return self.token
+
+
+def test_get_token_struct_does_not_share_tokens_between_credentials():
+    """
+    Test that a token cached for one credentials object is never handed to another,
+    even when the first object has been garbage-collected and its id() reused.
+    """
+    # pylint: disable=protected-access
+    resource = warehouse._TOKEN_RESOURCE
+    warehouse._get_token_struct(resource, _ShortLivedCredentials("identity_A"))
+    token_struct = warehouse._get_token_struct(resource, _ShortLivedCredentials("identity_B"))
+
+    assert token_struct == _pack_token("identity_B")
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_caches_engines_per_credentials(mock_create_engine, _mock_drivers):
+    """
+    Test that two identities targeting the same endpoint each get their own cached
+    engine, and neither call disposes the engine the other is using.
+    """
+    engine_a, engine_b = MagicMock(spec=_ENGINE_SPEC), MagicMock(spec=_ENGINE_SPEC)
+    mock_create_engine.side_effect = [engine_a, engine_b]
+    credentials_a = _ShortLivedCredentials("identity_A")
+    credentials_b = _ShortLivedCredentials("identity_B")
+
+    assert get_fabric_warehouse_engine("some.endpoint", credentials=credentials_a) is engine_a
+    assert get_fabric_warehouse_engine("some.endpoint", credentials=credentials_b) is engine_b
+    assert get_fabric_warehouse_engine("some.endpoint", credentials=credentials_a) is engine_a
+
+    assert mock_create_engine.call_count == 2
+    engine_a.dispose.assert_not_called()
+    engine_b.dispose.assert_not_called()
+
+
+@patch("pyodbc.drivers", return_value=["ODBC Driver 18 for SQL Server"])
+@patch("dataprepkit.helpers.connectors.warehouse._create_engine")
+def test_get_fabric_warehouse_engine_frees_engine_with_dropped_credentials(mock_create_engine, _mock_drivers, mock_event):
+    """
+    Test that once the caller drops an engine and its credentials, the cache no longer
+    holds either, so their connection pool can be garbage-collected.
+    """
+    mock_create_engine.side_effect = lambda *args, **kwargs: MagicMock(spec=_ENGINE_SPEC)
+    # Attach listeners to the engine, as SQLAlchemy does, so the engine references its credentials
+    mock_event.listen.side_effect = lambda target, _name, handler: setattr(target, f"_{_name}", handler)
+    credentials = _ShortLivedCredentials("identity_A")
+    engine = get_fabric_warehouse_engine("some.endpoint", credentials=credentials)
+    engine_ref, credentials_ref = weakref.ref(engine), weakref.ref(credentials)
+
+    # The recorded listen() call also references the engine; drop it with the caller's references
+    mock_event.reset_mock()
+    del engine, credentials
+    gc.collect()
+
+    assert engine_ref() is None
+    assert credentials_ref() is None
+    assert len(warehouse._engine_cache) == 0 # pylint: disable=protected-access
@@ -10,13 +10,20 @@ Pytest fixtures and helper functions support table creation and engine setup.
 """
 
 import pytest
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String
+from sqlalchemy import create_engine, exists, insert, select, MetaData, Table, Column, Integer, String
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable, DropTable
 from dataprepkit.helpers.transforms.insert_update import insert_new_records_dynamic
 
-@pytest.fixture
+# Compiled (table, drop_ddl, create_ddl) keyed by table name, column definitions and schema.
+_TABLE_DDL_CACHE = {}
+# Definition key of the table currently created under each (schema, name) on the shared engine.
+_CREATED_TABLES = {}
+
+@pytest.fixture(scope="session")
 def engine():
     """
-    Pytest fixture to create a temporary in-memory SQLite engine.
+    Pytest fixture to create an in-memory SQLite engine shared by every test.
 
     Yields
     ------
@@ -25,18 +32,42 @@ def engine():
 
     Notes
     -----
-    The engine is disposed after the test completes.
+    A `StaticPool` hands every checkout the same DBAPI connection, so all
+    connections see the same in-memory database without a fresh pool checkout.
+    The engine is disposed after the test session completes.
     """
     # pylint: disable=redefined-outer-name
-    engine = create_engine("sqlite:///:memory:")
+    engine = create_engine(
+        "sqlite:///:memory:",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+        insertmanyvalues_page_size=1000,
+    )
     yield engine
     engine.dispose()
 
+# pylint: disable=redefined-outer-name
+@pytest.fixture
+def connection(engine):
+    """
+    Pytest fixture yielding one connection used for both seeding and reading back
+    a test's tables. On the `StaticPool` engine it shares the DBAPI connection used
+    by `insert_new_records_dynamic`, so no further checkouts are needed.
+    """
+    with engine.connect() as conn:
+        yield conn
+
 # pylint: disable=redefined-outer-name
 def _create_table(engine, name, columns, schema=None):
     """
     Helper function to create a table with given columns in the database.
 
+    The helper is idempotent on the shared engine: if a table with the same
+    definition already exists its rows are deleted, otherwise any table with that
+    name is dropped and recreated from pre-compiled DDL. `insert_new_records_dynamic`
+    commits its own transactions, so tests are isolated by this reset rather than
+    by rolling back an outer transaction.
+
     Parameters
     ----------
     engine : sqlalchemy.engine.Engine
@@ -53,76 +84,86 @@ def _create_table(engine, name, columns, schema=None):
     sqlalchemy.Table
         The created SQLAlchemy Table object.
     """
-    metadata = MetaData()
-    cols = [Column(colname, coltype) for colname, coltype in columns.items()]
-    table = Table(name, metadata, *cols, schema=schema)
-    metadata.create_all(engine)
+    key = (name, tuple((colname, coltype.__name__) for colname, coltype in columns.items()), schema)
+    if key not in _TABLE_DDL_CACHE:
+        cols = [Column(colname, coltype) for colname, coltype in columns.items()]
+        table = Table(name, MetaData(), *cols, schema=schema)
+        _TABLE_DDL_CACHE[key] = (
+            table,
+            str(DropTable(table, if_exists=True).compile(dialect=engine.dialect)),
+            str(CreateTable(table).compile(dialect=engine.dialect)),
+        )
+    table, drop_ddl, create_ddl = _TABLE_DDL_CACHE[key]
+    with engine.begin() as conn:
+        if _CREATED_TABLES.get((schema, name)) == key:
+            conn.execute(table.delete())
+        else:
+            conn.exec_driver_sql(drop_ddl)
+            conn.exec_driver_sql(create_ddl)
+            _CREATED_TABLES[(schema, name)] = key
     return table
 
-# pylint: disable=redefined-outer-name
-def test_invalid_business_key_type(engine):
+def _existing_codes(conn, table, codes):
     """
-    Test that insert_new_records_dynamic raises ValueError when business_key is not
-    a string or list of strings.
+    Return the subset of `codes` present in the table's `Assurance_Cd` column,
+    filtered in SQL so only matching codes are fetched.
     """
-    with pytest.raises(ValueError, match="`business_key` must be a string or a list of strings"):
-        insert_new_records_dynamic(
-            engine,
-            "source",
-            "target",
-            business_key=123) # type: ignore[arg-type]
+    stmt = select(table.c.Assurance_Cd).where(table.c.Assurance_Cd.in_(codes)).distinct()
+    return set(conn.execute(stmt).scalars())
 
 # pylint: disable=redefined-outer-name
-def test_source_table_missing(engine):
+@pytest.mark.parametrize("setup_fn, kwargs, error_match", [
+    pytest.param(
+        lambda engine: None,
+        {"source_table": "source", "target_table": "target", "business_key": 123},
+        "`business_key` must be a string or a list of strings",
+        id="invalid_business_key_type",
+    ),
+    pytest.param(
+        lambda engine: _create_table(engine, "target", {"id": Integer, "Assurance_Cd": String}),
+        {"source_table": "missing_source", "target_table": "target"},
+        "Source table",
+        id="source_missing",
+    ),
+    pytest.param(
+        lambda engine: _create_table(engine, "source", {"id": Integer, "Assurance_Cd": String}),
+        {"source_table": "source", "target_table": "missing_target"},
+        "Target table",
+        id="target_missing",
+    ),
+    pytest.param(
+        lambda engine: (
+            _create_table(engine, "source", {"Assurance_Id": Integer, "colA": String}),
+            _create_table(engine, "target", {"Assurance_Id": Integer, "colB": String}),
+        ),
+        {"source_table": "source", "target_table": "target",
+         "surrogate_key": "Assurance_Id", "business_key": "Assurance_Cd"},
+        "No common columns",
+        id="no_common_columns",
+    ),
+    pytest.param(
+        lambda engine: (
+            _create_table(engine, "source", {"id": Integer, "colA": String}),
+            _create_table(engine, "target", {"id": Integer, "colA": String}),
+        ),
+        {"source_table": "source", "target_table": "target", "business_key": "Assurance_Cd"},
+        "Business key\\(s\\) missing",
+        id="missing_business_key_column",
+    ),
+])
+def test_validation_errors(engine, setup_fn, kwargs, error_match):
     """
-    Test that insert_new_records_dynamic raises ValueError when the source table
-    does not exist.
+    Test that insert_new_records_dynamic raises ValueError for invalid input:
+    a business key that is not a string or list of strings, a missing source or
+    target table, no common columns besides the surrogate key, or a business key
+    column missing from either table.
     """
-    _create_table(engine, "target", {"id": Integer, "Assurance_Cd": String})
-    with pytest.raises(ValueError, match="Source table"):
-        insert_new_records_dynamic(engine, "missing_source", "target")
+    setup_fn(engine)
+    with pytest.raises(ValueError, match=error_match):
+        insert_new_records_dynamic(engine, **kwargs)
 
 # pylint: disable=redefined-outer-name
-def test_target_table_missing(engine):
-    """
-    Test that insert_new_records_dynamic raises ValueError when the target table
-    does not exist.
-    """
-    _create_table(engine, "source", {"id": Integer, "Assurance_Cd": String})
-    with pytest.raises(ValueError, match="Target table"):
-        insert_new_records_dynamic(engine, "source", "missing_target")
-
-# pylint: disable=redefined-outer-name
-def test_no_common_columns(engine):
-    """
-    Test that insert_new_records_dynamic raises ValueError when source and target
-    tables have no common columns except the surrogate key.
-    """
-    _create_table(engine, "source", {"Assurance_Id": Integer, "colA": String})
-    _create_table(engine, "target", {"Assurance_Id": Integer, "colB": String})
-
-    with pytest.raises(ValueError, match="No common columns"):
-        insert_new_records_dynamic(
-            engine,
-            "source",
-            "target",
-            surrogate_key="Assurance_Id",
-            business_key="Assurance_Cd")
-
-# pylint: disable=redefined-outer-name
-def test_missing_business_key_column(engine):
-    """
-    Test that insert_new_records_dynamic raises ValueError when business key column
-    is missing from either source or target table.
-    """
-    _create_table(engine, "source", {"id": Integer, "colA": String})
-    _create_table(engine, "target", {"id": Integer, "colA": String})
-
-    with pytest.raises(ValueError, match="Business key\\(s\\) missing"):
-        insert_new_records_dynamic(engine, "source", "target", business_key="Assurance_Cd")
-
-# pylint: disable=redefined-outer-name
-def test_successful_insert(engine):
+def test_successful_insert(engine, connection):
     """
     Test successful insertion of new records from source to target when the target
     already contains some data. Verifies that only new records are inserted.
@@ -138,16 +179,13 @@ def test_successful_insert(engine):
         "Name": String
     })
 
-    # Insert some data in source
-    with engine.begin() as conn:
-        conn.execute(source.insert(), [
+    # Seed source, plus one row in target with surrogate key to simulate max_id = 2
+    with connection.begin():
+        connection.execute(insert(source), [
             {"Assurance_Id": 1, "Assurance_Cd": "A1", "Name": "Alpha"},
             {"Assurance_Id": 2, "Assurance_Cd": "B2", "Name": "Beta"},
         ])
-
-    # Insert one row in target with surrogate key to simulate max_id = 2
-    with engine.begin() as conn:
-        conn.execute(target.insert(), [
+        connection.execute(insert(target), [
             {"Assurance_Id": 2, "Assurance_Cd": "B2", "Name": "Beta"}
         ])
 
@@ -161,13 +199,10 @@ def test_successful_insert(engine):
         default_start_id=100
     )
 
-    with engine.connect() as conn:
-        rows = conn.execute(target.select()).fetchall()
-        assert any(row.Assurance_Cd == "A1" for row in rows)
-        assert any(row.Assurance_Cd == "B2" for row in rows)
+    assert _existing_codes(connection, target, ["A1", "B2"]) == {"A1", "B2"}
 
 # pylint: disable=redefined-outer-name
-def test_default_start_id_used_when_no_max_id(engine):
+def test_default_start_id_used_when_no_max_id(engine, connection):
     """
     Test that the default_start_id parameter is used when the target table is empty
     and no max surrogate key is found.
@@ -184,8 +219,8 @@ def test_default_start_id_used_when_no_max_id(engine):
     })
 
     # Insert data into source only
-    with engine.begin() as conn:
-        conn.execute(source.insert(), [
+    with connection.begin():
+        connection.execute(insert(source), [
             {"Assurance_Id": 10, "Assurance_Cd": "C3", "Name": "Gamma"},
         ])
 
@@ -199,11 +234,9 @@ def test_default_start_id_used_when_no_max_id(engine):
         default_start_id=1000
     )
 
-    with engine.connect() as conn:
-        rows = conn.execute(target.select()).fetchall()
-        assert any(row.Assurance_Cd == "C3" for row in rows)
+    assert connection.execute(select(exists().where(target.c.Assurance_Cd == "C3"))).scalar() is True
 
-def test_multiple_column_business_key_insert(engine):
+def test_multiple_column_business_key_insert(engine, connection):
     """
     Test insertion using multiple columns as a composite business key. Verifies
     that records missing from the target with matching composite keys are inserted.
@@ -221,16 +254,13 @@ def test_multiple_column_business_key_insert(engine):
         "Name": String
     })
 
-    # Insert data into source
-    with engine.begin() as conn:
-        conn.execute(source.insert(), [
+    # Seed source, plus one row in target with a matching business key to simulate existing record
+    with connection.begin():
+        connection.execute(insert(source), [
             {"Assurance_Id": 1, "Assurance_Cd": "A1", "Region": "East", "Name": "Alpha"},
             {"Assurance_Id": 2, "Assurance_Cd": "B2", "Region": "West", "Name": "Beta"},
         ])
-
-    # Insert one row into target with a matching business key to simulate existing record
-    with engine.begin() as conn:
-        conn.execute(target.insert(), [
+        connection.execute(insert(target), [
             {"Assurance_Id": 2, "Assurance_Cd": "B2", "Region": "West", "Name": "Beta"}
         ])
 
@@ -244,10 +274,5 @@ def test_multiple_column_business_key_insert(engine):
         default_start_id=500
     )
 
-    # Fetch all records from target
-    with engine.connect() as conn:
-        rows = conn.execute(target.select()).fetchall()
-
-    assurance_codes = {row.Assurance_Cd for row in rows}
-    assert "A1" in assurance_codes
-    assert "B2" in assurance_codes
+    # Check both codes are present in target
+    assert _existing_codes(connection, target, ["A1", "B2"]) == {"A1", "B2"}
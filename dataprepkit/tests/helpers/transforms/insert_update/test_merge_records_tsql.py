@@ -0,0 +1,80 @@
+import pytest
+from dataprepkit.helpers.transforms.insert_update import merge_records_tsql
+
+def test_merge_records_basic(fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 5
+
+    rowcount = merge_records_tsql(
+        engine=engine,
+        target_table="[dbo].[target]",
+        source_table="[staging].[source]",
+        join_keys="id",
+        columns_to_update=["value"],
+        columns_to_insert=["id", "value"]
+    )
+
+    sql = conn.sql[-1].text
+    assert "MERGE [dbo].[target] WITH (TABLOCK, HOLDLOCK) AS tgt" in sql
+    assert "USING [staging].[source] AS src" in sql
+    assert "ON tgt.[id] = src.[id]" in sql
+    assert "WHEN MATCHED AND EXISTS (SELECT src.[value] EXCEPT SELECT tgt.[value]) THEN" in sql
+    assert "tgt.[value] = src.[value]" in sql
+    assert "WHEN NOT MATCHED BY TARGET THEN" in sql
+    assert "INSERT ([id], [value])" in sql
+    assert "VALUES (src.[id], src.[value])" in sql
+    assert sql.rstrip().endswith(";")
+    assert rowcount == 5
+
+
+def test_merge_multiple_join_keys(fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 1
+
+    merge_records_tsql(
+        engine=engine,
+        target_table="target",
+        source_table="source",
+        join_keys=["id", "code"],
+        columns_to_update=["name"],
+        columns_to_insert=["id", "code", "name"]
+    )
+
+    sql = conn.sql[-1].text
+    assert "ON tgt.[id] = src.[id] AND tgt.[code] = src.[code]" in sql
+
+
+@pytest.mark.parametrize("columns_to_update, columns_to_insert, present, absent", [
+    (["value"], [], "WHEN MATCHED AND", "WHEN NOT MATCHED"),
+    ([], ["id", "value"], "WHEN NOT MATCHED BY TARGET THEN", "WHEN MATCHED AND"),
+])
+def test_merge_omits_empty_branch(columns_to_update, columns_to_insert, present, absent, fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 0
+
+    merge_records_tsql(
+        engine=engine,
+        target_table="target",
+        source_table="source",
+        join_keys="id",
+        columns_to_update=columns_to_update,
+        columns_to_insert=columns_to_insert
+    )
+
+    sql = conn.sql[-1].text
+    assert present in sql
+    assert absent not in sql
+
+
+def test_merge_raises_if_no_columns(fake_engine):
+    engine, _ = fake_engine
+
+    with pytest.raises(ValueError, match="At least one of `columns_to_update` or `columns_to_insert`"):
+        merge_records_tsql(
+            engine=engine,
+            target_table="target",
+            source_table="source",
+            join_keys="id",
+            columns_to_update=[],
+            columns_to_insert=[]
+        )
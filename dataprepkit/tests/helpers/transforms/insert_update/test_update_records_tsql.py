@@ -1,19 +1,11 @@
 import pytest
-from unittest.mock import MagicMock
-from dataprepkit.helpers.transforms.insert_update import update_records_tsql
+from sqlalchemy import create_engine, text
+from dataprepkit.helpers.transforms.insert_update import update_records_tsql, _build_change_predicate
 
-def _get_executed_sql(mock_conn):
-    # Helper to extract the SQL string from a mock call
-    return mock_conn.execute.call_args[0][0].text
 
-
-def test_update_records_basic():
-    engine = MagicMock()
-    conn = MagicMock()
-    result = MagicMock(rowcount=3)
-
-    engine.begin.return_value.__enter__.return_value = conn
-    conn.execute.return_value = result
+def test_update_records_basic(fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 3
 
     rowcount = update_records_tsql(
         engine=engine,
@@ -24,7 +16,7 @@ def test_update_records_basic():
         columns_to_update=["value"]
     )
 
-    sql = _get_executed_sql(conn)
+    sql = conn.sql[-1].text
     assert "UPDATE tgt" in sql
     assert "FROM [target] tgt" in sql
     assert "INNER JOIN [source] src" in sql
@@ -34,13 +26,9 @@ def test_update_records_basic():
     assert rowcount == 3
 
 
-def test_update_multiple_join_keys():
-    engine = MagicMock()
-    conn = MagicMock()
-    result = MagicMock(rowcount=1)
-
-    engine.begin.return_value.__enter__.return_value = conn
-    conn.execute.return_value = result
+def test_update_multiple_join_keys(fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 1
 
     rowcount = update_records_tsql(
         engine=engine,
@@ -51,20 +39,16 @@ def test_update_multiple_join_keys():
         columns_to_update=["name"]
     )
 
-    sql = _get_executed_sql(conn)
+    sql = conn.sql[-1].text
     assert "tgt.[id] = src.[id]" in sql
     assert "tgt.[code] = src.[code]" in sql
     assert "tgt.[name] = src.[name]" in sql
     assert rowcount == 1
 
 
-def test_update_with_schema_qualified_names():
-    engine = MagicMock()
-    conn = MagicMock()
-    result = MagicMock(rowcount=2)
-
-    engine.begin.return_value.__enter__.return_value = conn
-    conn.execute.return_value = result
+def test_update_with_schema_qualified_names(fake_engine):
+    engine, conn = fake_engine
+    conn.rowcount = 2
 
     rowcount = update_records_tsql(
         engine=engine,
@@ -75,7 +59,7 @@ def test_update_with_schema_qualified_names():
         columns_to_update=["Name", "Status"]
     )
 
-    sql = _get_executed_sql(conn)
+    sql = conn.sql[-1].text
     assert "FROM [dbo].[target_table] tgt" in sql
     assert "INNER JOIN [dbo].[source_table] src" in sql
     assert "tgt.[Name] = src.[Name]" in sql
@@ -83,8 +67,8 @@ def test_update_with_schema_qualified_names():
     assert rowcount == 2
 
 
-def test_update_raises_if_columns_empty():
-    engine = MagicMock()
+def test_update_raises_if_columns_empty(fake_engine):
+    engine, _ = fake_engine
 
     with pytest.raises(ValueError, match="`columns_to_update` must be a non-empty list"):
         update_records_tsql(
@@ -97,14 +81,53 @@ def test_update_raises_if_columns_empty():
         )
 
 
-def test_update_with_dot_notation_tables():
-    """Ensure dot notation without brackets is handled (e.g., dbo.table)"""
-    engine = MagicMock()
-    conn = MagicMock()
-    result = MagicMock(rowcount=4)
+def test_update_skips_unchanged(fake_engine):
+    """Unchanged rows are excluded by a NULL-safe EXISTS/EXCEPT change predicate"""
+    engine, conn = fake_engine
+
+    update_records_tsql(
+        engine=engine,
+        target_table="target",
+        source_table="source",
+        join_keys="id",
+        surrogate_key="id",
+        columns_to_update=["name", "status"]
+    )
+
+    sql = conn.sql[-1].text
+    assert (
+        "AND EXISTS (SELECT src.[name], src.[status] EXCEPT SELECT tgt.[name], tgt.[status])"
+        in sql
+    )
 
-    engine.begin.return_value.__enter__.return_value = conn
-    conn.execute.return_value = result
+
+def test_change_predicate_matches_only_changed_rows():
+    """The EXISTS/EXCEPT predicate treats NULLs as equal and matches only rows that differ"""
+    engine = create_engine("sqlite:///:memory:")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE target (id INTEGER, name TEXT, status TEXT)"))
+        conn.execute(text("CREATE TABLE source (id INTEGER, name TEXT, status TEXT)"))
+        conn.execute(text(
+            "INSERT INTO target VALUES (1, 'a', 'x'), (2, 'b', NULL), (3, 'c', NULL), (4, 'd', 'y')"
+        ))
+        conn.execute(text(
+            "INSERT INTO source VALUES (1, 'a', 'x'), (2, 'b', NULL), (3, 'c', 'z'), (4, 'd', NULL)"
+        ))
+        predicate = _build_change_predicate(["name", "status"])
+        changed = conn.execute(text(
+            f"SELECT tgt.[id] FROM target tgt INNER JOIN source src ON tgt.[id] = src.[id] "
+            f"WHERE {predicate} ORDER BY tgt.[id]"
+        )).scalars().all()
+    engine.dispose()
+
+    # Rows 1 and 2 are identical (including the NULL status); 3 and 4 differ through a NULL
+    assert changed == [3, 4]
+
+
+def test_update_with_dot_notation_tables(fake_engine):
+    """Ensure dot notation without brackets is handled (e.g., dbo.table)"""
+    engine, conn = fake_engine
+    conn.rowcount = 4
 
     rowcount = update_records_tsql(
         engine=engine,
@@ -115,9 +138,84 @@ def test_update_with_dot_notation_tables():
         columns_to_update=["email"]
     )
 
-    sql = _get_executed_sql(conn)
+    sql = conn.sql[-1].text
     assert "FROM [dbo].[target] tgt" in sql
     assert "INNER JOIN [dbo].[source] src" in sql
     assert "tgt.[email] = src.[email]" in sql
     assert "tgt.[user_id] = src.[user_id]" in sql
     assert rowcount == 4
+
+
+def test_update_rejects_bad_identifier(fake_engine):
+    engine, conn = fake_engine
+
+    with pytest.raises(ValueError, match="not in the format"):
+        update_records_tsql(
+            engine=engine,
+            target_table="target; DROP TABLE x",
+            source_table="source",
+            join_keys="id",
+            surrogate_key="id",
+            columns_to_update=["value"]
+        )
+    assert not conn.sql
+
+
+def test_update_returns_changed_keys(fake_engine):
+    engine, conn = fake_engine
+    conn.rows = [(5,), (7,)]
+
+    rowcount, changed_keys = update_records_tsql(
+        engine=engine,
+        target_table="target",
+        source_table="source",
+        join_keys="code",
+        surrogate_key="id",
+        columns_to_update=["value"],
+        return_changed_keys=True
+    )
+
+    sql = conn.sql[-1].text
+    assert "OUTPUT inserted.[id]\n" in sql
+    assert sql.index("OUTPUT inserted.[id]") < sql.index("FROM [target] tgt")
+    # The keys come back from the UPDATE itself; no table variable or NOCOUNT is needed
+    assert "INTO" not in sql
+    assert "@changed" not in sql
+    assert rowcount == 2
+    assert changed_keys == [5, 7]
+
+
+def test_update_escapes_column_names(fake_engine):
+    engine, conn = fake_engine
+
+    update_records_tsql(
+        engine=engine,
+        target_table="target",
+        source_table="source",
+        join_keys="Company Code",
+        surrogate_key="id",
+        columns_to_update=["Cost-Centre", "odd]name"]
+    )
+
+    sql = conn.sql[-1].text
+    assert "tgt.[Company Code] = src.[Company Code]" in sql
+    assert "tgt.[Cost-Centre] = src.[Cost-Centre]" in sql
+    assert "tgt.[odd]]name] = src.[odd]]name]" in sql
+
+
+def test_update_leaves_nocount_off(fake_engine):
+    """Pooled connections must not be returned with NOCOUNT on, or later rowcounts read -1"""
+    engine, conn = fake_engine
+
+    for return_changed_keys in (False, True):
+        update_records_tsql(
+            engine=engine,
+            target_table="target",
+            source_table="source",
+            join_keys="code",
+            surrogate_key="id",
+            columns_to_update=["value"],
+            return_changed_keys=return_changed_keys
+        )
+
+    assert all("NOCOUNT ON" not in statement.text for statement in conn.sql)
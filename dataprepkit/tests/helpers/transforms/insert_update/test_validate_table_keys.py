@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import create_engine, insert, MetaData, Table, Column, Integer, String
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import text
+from dataprepkit.helpers.transforms.insert_update import validate_table_keys
+
+VALID_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "A", "category": "Y"},
+]
+NULL_CODE_ROWS = [
+    {"id": 1, "code": None, "category": "X"},
+    {"id": 2, "code": "B", "category": "Y"},
+]
+DUPLICATE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "A", "category": "X"},
+    {"id": 3, "code": "B", "category": "Y"},
+]
+NULL_AND_DUPLICATE_ROWS = [
+    {"id": 1, "code": None, "category": "X"},
+    {"id": 2, "code": "A", "category": "Y"},
+    {"id": 3, "code": "A", "category": "Z"},
+]
+
+@pytest.fixture(scope="module")
+def engine():
+    # One in-memory database for the whole module; StaticPool keeps the single connection alive
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="module")
+def sample_table(engine):
+    metadata = MetaData()
+    table = Table(
+        "sample_table", metadata,
+        Column("id", Integer),
+        Column("code", String),
+        Column("category", String)
+    )
+    metadata.create_all(engine)
+    return table
+
+@pytest.fixture(autouse=True)
+def _clean(engine, sample_table):
+    yield
+    with engine.begin() as conn:
+        conn.execute(sample_table.delete())
+
+def _load(engine, sample_table, rows):
+    # One multi-row INSERT ... VALUES statement per test
+    with engine.begin() as conn:
+        conn.execute(insert(sample_table).values(rows))
+
+def test_valid_keys(engine, sample_table):
+    _load(engine, sample_table, VALID_ROWS)
+    # Should not raise
+    validate_table_keys(engine, "[sample_table]", ["code", "category"])
+
+def test_null_keys(engine, sample_table):
+    _load(engine, sample_table, NULL_CODE_ROWS)
+    with pytest.raises(ValueError, match="Found 1 rows with NULL values in business key"):
+        validate_table_keys(engine, "[sample_table]", ["code"])
+
+def test_duplicate_keys(engine, sample_table):
+    _load(engine, sample_table, DUPLICATE_ROWS)
+    with pytest.raises(ValueError, match="Found 2 rows with duplicate values in business key"):
+        validate_table_keys(engine, "[sample_table]", ["code", "category"])
+
+def test_nulls_and_duplicates_reported_together(engine, sample_table):
+    _load(engine, sample_table, NULL_AND_DUPLICATE_ROWS)
+    with pytest.raises(ValueError, match="Found 1 rows with NULL values and 2 rows with duplicate values"):
+        validate_table_keys(engine, "[sample_table]", ["code"])
+
+def test_empty_table_valid_keys(engine, sample_table):
+    # No rows inserted, should pass
+    validate_table_keys(engine, "[sample_table]", ["code"])
+
+def test_empty_business_keys_rejected(engine, sample_table):
+    with pytest.raises(ValueError, match="At least one business key must be provided"):
+        validate_table_keys(engine, "[sample_table]", [])
+
+@pytest.mark.parametrize("column", [
+    pytest.param("cnt", id="cnt"),
+    pytest.param("row_count", id="row_count"),
+    pytest.param("key_0", id="key_0"),
+])
+def test_key_named_like_grouped_column(engine, column):
+    # A key column that shares a name with a column of the grouped pass must still be checked
+    with engine.begin() as conn:
+        conn.execute(text(f"CREATE TABLE named_key_table ([{column}] INTEGER)"))
+        conn.execute(text(f"INSERT INTO named_key_table ([{column}]) VALUES (NULL), (1), (1)"))
+    try:
+        with pytest.raises(ValueError, match="Found 1 rows with NULL values and 2 rows with duplicate values"):
+            validate_table_keys(engine, "[named_key_table]", [column])
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE named_key_table"))
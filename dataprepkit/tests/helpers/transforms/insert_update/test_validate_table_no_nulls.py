@@ -1,14 +1,34 @@
 import pytest
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String
+from sqlalchemy import create_engine, insert, MetaData, Table, Column, Integer, String
+from sqlalchemy.pool import StaticPool
 from dataprepkit.helpers.transforms.insert_update import validate_table_no_nulls
 
-@pytest.fixture
+COMPLETE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "B", "category": "Y"},
+]
+NULL_CODE_ROWS = [
+    {"id": 1, "code": None, "category": "X"},
+    {"id": 2, "code": "B", "category": "Y"},
+]
+NULL_CODE_AND_CATEGORY_ROWS = [
+    {"id": 1, "code": None, "category": None},
+    {"id": 2, "code": "B", "category": "Y"},
+]
+NULL_AND_DUPLICATE_ROWS = [
+    {"id": 1, "code": None, "category": "X"},
+    {"id": 2, "code": "A", "category": "Y"},
+    {"id": 3, "code": "A", "category": "Y"},
+]
+
+@pytest.fixture(scope="module")
 def engine():
-    engine = create_engine("sqlite:///:memory:")
+    # One in-memory database for the whole module; StaticPool keeps the single connection alive
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
     yield engine
     engine.dispose()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_table(engine):
     metadata = MetaData()
     table = Table(
@@ -20,37 +40,62 @@ def sample_table(engine):
     metadata.create_all(engine)
     return table
 
-def test_no_nulls(engine, sample_table):
+@pytest.fixture(autouse=True)
+def _clean(engine, sample_table):
+    yield
     with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": "A", "category": "X"},
-            {"id": 2, "code": "B", "category": "Y"},
-        ])
-    qualified_table = "[sample_table]"
-    # Should not raise
-    validate_table_no_nulls(engine, qualified_table, ["code"])
+        conn.execute(sample_table.delete())
 
-def test_null_in_single_key(engine, sample_table):
+def _load(engine, sample_table, rows):
+    # One multi-row INSERT ... VALUES statement per test
     with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": None, "category": "X"},
-            {"id": 2, "code": "B", "category": "Y"},
-        ])
+        conn.execute(insert(sample_table).values(rows))
+
+def test_no_nulls(engine, sample_table):
+    _load(engine, sample_table, COMPLETE_ROWS)
     qualified_table = "[sample_table]"
-    with pytest.raises(ValueError, match="Found 1 rows with NULL values"):
-        validate_table_no_nulls(engine, qualified_table, ["code"])
+    # Should not raise
+    validate_table_no_nulls(engine, qualified_table, ["code"])
 
-def test_null_in_multiple_keys(engine, sample_table):
-    with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": None, "category": None},
-            {"id": 2, "code": "B", "category": "Y"},
-        ])
+@pytest.mark.parametrize("rows, business_keys", [
+    pytest.param(NULL_CODE_ROWS, ["code"], id="single_key"),
+    pytest.param(NULL_CODE_AND_CATEGORY_ROWS, ["code", "category"], id="multiple_keys"),
+])
+def test_null_in_keys(engine, sample_table, rows, business_keys):
+    _load(engine, sample_table, rows)
     qualified_table = "[sample_table]"
     with pytest.raises(ValueError, match="Found 1 rows with NULL values"):
-        validate_table_no_nulls(engine, qualified_table, ["code", "category"])
+        validate_table_no_nulls(engine, qualified_table, business_keys)
 
 def test_empty_table_no_nulls(engine, sample_table):
     qualified_table = "[sample_table]"
     # No rows inserted, should pass
     validate_table_no_nulls(engine, qualified_table, ["code"])
+
+def test_duplicates_not_reported(engine, sample_table):
+    _load(engine, sample_table, NULL_AND_DUPLICATE_ROWS)
+    qualified_table = "[sample_table]"
+    # Only the NULL check is enabled, so the duplicate "A" rows are not reported
+    with pytest.raises(ValueError, match="Found 1 rows with NULL values in business key") as exc_info:
+        validate_table_no_nulls(engine, qualified_table, ["code"])
+    assert "duplicate" not in str(exc_info.value)
+
+def test_identifier_injection_escaped(fake_engine):
+    engine, conn = fake_engine
+    conn.scalar_value = 0
+    # A closing bracket is doubled so the name cannot end the quoted identifier
+    validate_table_no_nulls(engine, "[sample_table]", ["col]; DROP", "Company Code"])
+    assert "[col]]; DROP] IS NULL OR [Company Code] IS NULL" in conn.sql[0].text
+
+def test_invalid_column_name_rejected(engine, sample_table):
+    qualified_table = "[sample_table]"
+    with pytest.raises(ValueError, match="Invalid column name"):
+        validate_table_no_nulls(engine, qualified_table, ["code\x00"])
+
+def test_empty_table_single_query(fake_engine):
+    engine, conn = fake_engine
+    conn.scalar_value = 0
+    # Should not raise, and the NULL count is read with one statement
+    validate_table_no_nulls(engine, "[sample_table]", ["code", "category"])
+    assert len(conn.sql) == 1
+    assert "COUNT(*)" in conn.sql[0].text
@@ -1,15 +1,46 @@
 import pytest
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String
+from sqlalchemy import create_engine, insert, MetaData, Table, Column, Integer, String
+from sqlalchemy.pool import StaticPool
 from sqlalchemy.exc import OperationalError
-from dataprepkit.helpers.transforms.insert_update import validate_table_uniqueness
+from dataprepkit.helpers.transforms.insert_update import validate_table_uniqueness, validate_table_uniqueness_batch
 
-@pytest.fixture
+UNIQUE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "B", "category": "Y"},
+    {"id": 3, "code": "C", "category": "X"},
+]
+DUPLICATE_CODE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "A", "category": "Y"},
+]
+DUPLICATE_COMPOSITE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "A", "category": "X"},
+    {"id": 3, "code": "B", "category": "Y"},
+]
+NULL_CODE_ROWS = [
+    {"id": 1, "code": None, "category": "X"},
+    {"id": 2, "code": "A", "category": "Y"},
+]
+# "id" and "category" are both duplicated, "code" is unique
+BATCH_DUPLICATE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 1, "code": "B", "category": "X"},
+    {"id": 2, "code": "C", "category": "Y"},
+]
+BATCH_UNIQUE_ROWS = [
+    {"id": 1, "code": "A", "category": "X"},
+    {"id": 2, "code": "B", "category": "X"},
+]
+
+@pytest.fixture(scope="module")
 def engine():
-    engine = create_engine("sqlite:///:memory:")
+    # One in-memory database for the whole module; StaticPool keeps the single connection alive
+    engine = create_engine("sqlite:///:memory:", poolclass=StaticPool)
     yield engine
     engine.dispose()
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_table(engine):
     metadata = MetaData()
     table = Table(
@@ -21,41 +52,64 @@ def sample_table(engine):
     metadata.create_all(engine)
     return table
 
-def test_no_duplicates(engine, sample_table):
-    # Insert unique rows
+@pytest.fixture(autouse=True)
+def _clean(engine, sample_table):
+    yield
     with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": "A", "category": "X"},
-            {"id": 2, "code": "B", "category": "Y"},
-            {"id": 3, "code": "C", "category": "X"},
-        ])
-    qualified_table = "[sample_table]"
-    # Should not raise
-    validate_table_uniqueness(engine, qualified_table, ["code"])
+        conn.execute(sample_table.delete())
 
-def test_duplicates_single_key(engine, sample_table):
+def _load(engine, sample_table, rows):
+    # One multi-row INSERT ... VALUES statement per test
     with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": "A", "category": "X"},
-            {"id": 2, "code": "A", "category": "Y"},
-        ])
-    qualified_table = "[sample_table]"
-    with pytest.raises(ValueError, match="Duplicate business keys found"):
-        validate_table_uniqueness(engine, qualified_table, ["code"])
+        conn.execute(insert(sample_table).values(rows))
 
-def test_duplicates_multiple_keys(engine, sample_table):
-    with engine.begin() as conn:
-        conn.execute(sample_table.insert(), [
-            {"id": 1, "code": "A", "category": "X"},
-            {"id": 2, "code": "A", "category": "X"},
-            {"id": 3, "code": "B", "category": "Y"},
-        ])
+def test_no_duplicates(engine, sample_table):
+    _load(engine, sample_table, UNIQUE_ROWS)
     qualified_table = "[sample_table]"
+    # Should not raise
+    validate_table_uniqueness(engine, qualified_table, ["code"])
+
+@pytest.mark.parametrize("rows, business_keys", [
+    pytest.param(DUPLICATE_CODE_ROWS, ["code"], id="single_key"),
     # Duplicate on composite key (code, category)
+    pytest.param(DUPLICATE_COMPOSITE_ROWS, ["code", "category"], id="multiple_keys"),
+])
+def test_duplicates(engine, sample_table, rows, business_keys):
+    _load(engine, sample_table, rows)
+    qualified_table = "[sample_table]"
     with pytest.raises(ValueError, match="Duplicate business keys found"):
-        validate_table_uniqueness(engine, qualified_table, ["code", "category"])
+        validate_table_uniqueness(engine, qualified_table, business_keys)
 
 def test_empty_table_no_duplicates(engine, sample_table):
     qualified_table = "[sample_table]"
     # No rows inserted, should pass
     validate_table_uniqueness(engine, qualified_table, ["code"])
+
+def test_single_null_not_reported(engine, sample_table):
+    _load(engine, sample_table, NULL_CODE_ROWS)
+    qualified_table = "[sample_table]"
+    # Only the uniqueness check is enabled, so the NULL code does not raise
+    validate_table_uniqueness(engine, qualified_table, ["code"])
+
+def test_batch_multiple_keysets(engine, sample_table):
+    _load(engine, sample_table, BATCH_DUPLICATE_ROWS)
+    qualified_table = "[sample_table]"
+    with pytest.raises(ValueError) as exc_info:
+        validate_table_uniqueness_batch(engine, qualified_table, [["code"], ["id"], ["category"]])
+    message = str(exc_info.value)
+    assert "['id'] (1 groups)" in message
+    assert "['category'] (1 groups)" in message
+    assert "['code']" not in message
+
+def test_batch_no_duplicates(engine, sample_table):
+    _load(engine, sample_table, BATCH_UNIQUE_ROWS)
+    # Should not raise
+    validate_table_uniqueness_batch(engine, "[sample_table]", [["id"], ["code", "category"]])
+
+@pytest.mark.parametrize("key_sets", [
+    pytest.param([[]], id="only_set"),
+    pytest.param([["code"], []], id="second_set"),
+])
+def test_batch_empty_key_set_rejected(engine, sample_table, key_sets):
+    with pytest.raises(ValueError, match=f"Business key set {len(key_sets) - 1} is empty"):
+        validate_table_uniqueness_batch(engine, "[sample_table]", key_sets)